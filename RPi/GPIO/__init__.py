@@ -4,12 +4,11 @@
 
 import os
 import sys
-import struct
+import atexit
 import warnings
-from time import sleep
+from array import array
 from pathlib import Path
-from threading import Event
-from weakref import WeakValueDictionary
+from threading import Event, Lock
 
 import lgpio
 
@@ -22,6 +21,14 @@ except AttributeError:
     lgpio.SET_PULL_UP = lgpio.SET_BIAS_PULL_UP
     lgpio.SET_PULL_DOWN = lgpio.SET_BIAS_PULL_DOWN
 
+# Aliases of the lgpio functions called by input(), output() and PWM, saving
+# an attribute lookup on each call
+_gpio_read = lgpio.gpio_read
+_gpio_write = lgpio.gpio_write
+_group_write = lgpio.group_write
+_tx_pwm = lgpio.tx_pwm
+_error_text = lgpio.error_text
+
 # This is *not* the version of rpi-lgpio, but is the version of RPi.GPIO we
 # seek to emulate
 VERSION = '0.7.2'
@@ -48,6 +55,23 @@ SPI = 41
 I2C = 42
 HARD_PWM = 43
 
+# Validation uses tuples (compared by equality) rather than sets or the
+# mappings below so that unhashable arguments raise ValueError, not TypeError
+_VALID_MODES = (BOARD, BCM)
+_VALID_PULLS = (PUD_OFF, PUD_DOWN, PUD_UP)
+_VALID_EDGES = (FALLING, RISING, BOTH)
+
+# Mappings of the pull and edge constants above to their lgpio equivalents
+_PULL_MAP = {
+    PUD_OFF:  lgpio.SET_PULL_NONE,
+    PUD_DOWN: lgpio.SET_PULL_DOWN,
+    PUD_UP:   lgpio.SET_PULL_UP,
+}
+_EDGE_MAP = {
+    RISING:  lgpio.RISING_EDGE,
+    FALLING: lgpio.FALLING_EDGE,
+    BOTH:    lgpio.BOTH_EDGES,
+}
 
 # Note the nuance of the early boards (in which GPIO0/1 and GPIO2/3 were
 # switched) is not represented here. This library (currently) has no intention
@@ -59,45 +83,70 @@ _BOARD_MAP = {
     33: 13, 35: 19, 36: 16, 37: 26, 38: 20, 40: 21,
 }
 _BCM_MAP = {channel: gpio for (gpio, channel) in _BOARD_MAP.items()}
-
-# LG mode constants
-_LG_INPUT = 0x100
-_LG_OUTPUT = 0x200
-_LG_ALERT = 0x400
-_LG_GROUP = 0x800
-_LG_MODES = (_LG_INPUT | _LG_OUTPUT | _LG_ALERT | _LG_GROUP)
-_LG_PULL_UP = 0x20
-_LG_PULL_DOWN = 0x40
-_LG_PULL_NONE = 0x80
-_LG_PULLS = (_LG_PULL_UP | _LG_PULL_DOWN | _LG_PULL_NONE)
+# The same mapping frozen into a tuple indexed by channel, with -1 for invalid
+# channels
+_BOARD_LUT = tuple(
+    _BOARD_MAP.get(channel, -1) for channel in range(max(_BOARD_MAP) + 1))
+_BCM_LUT = tuple(_BCM_MAP.get(gpio, -1) for gpio in range(max(_BCM_MAP) + 1))
 
 _mode = UNKNOWN
 _chip = None
+_chip_lock = Lock()
 _warnings = True
 
+# The settings each GPIO was claimed with by setup(), as parallel arrays
+# indexed by GPIO number; this saves querying lgpio for every GPIO on the
+# chip to determine which we own. _pin_dir is the direction (IN or OUT), or
+# -1 if the GPIO is not claimed, and _pin_pull the pull (PUD_*). For GPIOs
+# claimed together as an lgpio group, _pin_group is the group leader (the
+# first GPIO of the group) and _pin_gidx the GPIO's bit within the group;
+# both are -1 for individually claimed GPIOs
+_GPIO_COUNT = 54
+_pin_dir = array('b', [-1] * _GPIO_COUNT)
+_pin_pull = array('b', [-1] * _GPIO_COUNT)
+_pin_group = array('b', [-1] * _GPIO_COUNT)
+_pin_gidx = array('b', [-1] * _GPIO_COUNT)
+# Mapping of group leader to the tuple of GPIOs in the group, in bit order
+_groups = {}
+# GPIOs that pulse() has started outputting pulses on; see _pulsing
+_pulses = set()
+# Translation table for converting a bytes string of 0/1 values to ASCII
+# binary digits (for parsing with int)
+_BINARY_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
 
 # Mapping of GPIO number to _Alert instances
 _alerts = {}
 class _Alert:
     """
     A trivial class encapsulating a single GPIO set for alerts. Stores the
-    edge (which we override with the gpiochip API2 result, if available), the
-    bouncetime (which we can't get from anywhere else), the default tally
-    callback, and the list of user callbacks.
+    edge and bouncetime it was claimed with (which we can't get from anywhere
+    else), the tuple of user callbacks, and the :class:`~threading.Event` that
+    :func:`wait_for_edge` blocks on (re-used by each call while the alert
+    exists).
+
+    Alerts set up by :func:`wait_for_edge` are left in place afterwards (so
+    that repeated waits on a GPIO don't re-claim it each time), but are not
+    *enabled* (as far as :func:`add_event_callback` and :func:`event_detected`
+    are concerned) until :func:`add_event_detect` is called.
     """
     __slots__ = (
-        'gpio', '_edge', 'bouncetime', 'callbacks', '_detected', '_callback')
+        'gpio', 'edge', 'bouncetime', 'callbacks', 'event', 'waiting',
+        'enabled', '_detected', '_callback')
 
     def __init__(self, gpio, edge, bouncetime=None):
         self.gpio = gpio
-        self._edge = edge
+        self.edge = edge
         self.bouncetime = bouncetime
-        self.callbacks = []
+        self.callbacks = ()
+        self.event = Event()
+        self.waiting = False
+        self.enabled = False
         self._detected = False
         if bouncetime is not None:
             _check(lgpio.gpio_set_debounce_micros(
                 _chip, gpio, bouncetime * 1000))
-        self._callback = lgpio.callback(_chip, gpio, func=self._call)
+        self._callback = lgpio.callback(_chip, gpio, func=self._make_call())
 
     def __repr__(self):
         return f'_Alert({self.gpio}, {self.edge}, {self.bouncetime})'
@@ -105,34 +154,40 @@ class _Alert:
     def close(self):
         self._callback.cancel()
 
-    def _call(self, chip, gpio, level, timestamp):
-        if level == 2:
-            # Watchdog timeout; this *shouldn't* happen as we never use this
-            # part of lgpio but if there's something else messing with the API
-            # other than this shim it's a possibility
-            return
-        self._detected = True
-        for cb in self.callbacks:
-            try:
-                cb(_from_gpio(gpio))
-            except Exception as exc:
-                # Bug compatibility: this is how RPi.GPIO operates
-                print(exc, file=sys.stderr)
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            self._detected = False
 
-    @property
-    def edge(self):
-        # Attempt to determine the edges for this alert from gpiochip API2. If
-        # this results in no edges, we're on gpiochip API1, so use the stored
-        # value.
-        mode = (lgpio.gpio_get_mode(_chip, self.gpio) >> 17) & 3
-        try:
-            return {
-                1: lgpio.RISING_EDGE,
-                2: lgpio.FALLING_EDGE,
-                3: lgpio.BOTH_EDGES,
-            }[mode]
-        except KeyError:
-            return self._edge
+    def _make_call(self):
+        # The function lgpio calls from its thread on every edge; the GPIO
+        # translation is bound as a default to keep lookups in it local. The
+        # translation can't change while the alert exists as the numbering
+        # mode can only be reset by a full cleanup, which removes all alerts
+        def call(chip, gpio, level, timestamp, _self=self,
+                 _from_gpio=_from_gpio):
+            if level == 2:
+                # Watchdog timeout; this *shouldn't* happen as we never use
+                # this part of lgpio but if there's something else messing
+                # with the API other than this shim it's a possibility
+                return
+            _self._detected = True
+            # Wake wait_for_edge directly rather than via a user-style
+            # callback
+            if _self.waiting:
+                _self.event.set()
+            # callbacks is a tuple, replaced (never mutated) when a callback
+            # is added, so this iterates a consistent snapshot
+            callbacks = _self.callbacks
+            if callbacks:
+                channel = _from_gpio(gpio)
+                for cb in callbacks:
+                    try:
+                        cb(channel)
+                    except Exception as exc:
+                        # Bug compatibility: this is how RPi.GPIO operates
+                        print(exc, file=sys.stderr)
+        return call
 
     @property
     def detected(self):
@@ -142,7 +197,7 @@ class _Alert:
         return False
 
 
-_pwms = WeakValueDictionary()
+_pwms = set()
 class PWM:
     """
     Initializes and controls software-based PWM (Pulse Width Modulation) on the
@@ -159,24 +214,38 @@ class PWM:
 
     .. _PWM: https://en.wikipedia.org/wiki/Pulse-width-modulation
     """
-    __slots__ = ('_gpio', '_frequency', '_dc', '_running', '__weakref__')
+    __slots__ = ('_gpio', '_frequency', '_dc', '_running')
 
     def __init__(self, channel, frequency):
-        self._gpio = _to_gpio(channel)
-        if self._gpio in _pwms:
+        gpio = _to_gpio(channel)
+        if gpio in _pwms:
             raise RuntimeError(
                 'A PWM object already exists for this GPIO channel')
-        _check_output(lgpio.gpio_get_mode(_chip, self._gpio))
-        _pwms[self._gpio] = self
+        _check_output(gpio)
+        if _pulsing(gpio):
+            raise RuntimeError('The GPIO channel is outputting pulses')
+        _ungroup(gpio)
         self._frequency = None
         self._dc = None
         self._running = False
         self.ChangeFrequency(frequency)
         if self._frequency <= 0.0:
             raise ValueError('frequency must be greater than 0.0')
+        # The GPIO is only assigned (and registered in _pwms) once everything
+        # has been validated; a partially constructed instance must not stop,
+        # or unregister, a GPIO that belongs to another instance in __del__
+        self._gpio = gpio
+        _pwms.add(gpio)
 
     def __del__(self):
-        self.stop()
+        try:
+            gpio = self._gpio
+        except AttributeError:
+            return
+        try:
+            self.stop()
+        finally:
+            _pwms.discard(gpio)
 
     def start(self, dc):
         """
@@ -188,7 +257,7 @@ class PWM:
         """
         self.ChangeDutyCycle(dc)
         self._running = True
-        lgpio.tx_pwm(_chip, self._gpio, self._frequency, dc)
+        _tx_pwm(_chip, self._gpio, self._frequency, dc)
 
     def stop(self):
         """
@@ -197,12 +266,16 @@ class PWM:
         """
         # We do not care about errors in stop; __del__ methods (from which this
         # is called) should generally avoid exceptions but moreover, it should
-        # be idempotent on outputs
+        # be idempotent on outputs. Without a chip (as in a forked child)
+        # there is nothing to stop
+        if _chip is None:
+            self._running = False
+            return
         try:
-            lgpio.tx_pwm(_chip, self._gpio, 0, 0)
+            _tx_pwm(_chip, self._gpio, 0, 0)
         except lgpio.error:
             pass
-        lgpio.gpio_write(_chip, self._gpio, 0)
+        _gpio_write(_chip, self._gpio, 0)
         self._running = False
 
     def ChangeDutyCycle(self, dc):
@@ -214,7 +287,7 @@ class PWM:
         if not 0 <= self._dc <= 100:
             raise ValueError('dutycycle must have a value from 0.0 to 100.0')
         if self._running:
-            lgpio.tx_pwm(_chip, self._gpio, self._frequency, self._dc)
+            _tx_pwm(_chip, self._gpio, self._frequency, self._dc)
 
     def ChangeFrequency(self, frequency):
         """
@@ -224,7 +297,7 @@ class PWM:
         if self._frequency <= 0.0:
             raise ValueError('frequency must be greater than 0.0')
         if self._running:
-            lgpio.tx_pwm(_chip, self._gpio, self._frequency, self._dc)
+            _tx_pwm(_chip, self._gpio, self._frequency, self._dc)
 
 
 def _check(result):
@@ -234,29 +307,27 @@ def _check(result):
     and passes non-negative results back to the caller.
     """
     if result < 0:
-        raise RuntimeError(lgpio.error_text(result))
+        raise RuntimeError(_error_text(result))
     return result
 
 
-def _check_input(mode,
+def _check_input(gpio,
                  msg='You must setup() the GPIO channel as an input first'):
     """
-    Raises :exc:`RuntimeError` if *mode* (as returned by
-    :func:`lgpio.gpio_get_mode`) does not indicate that the GPIO is configured
-    for "Input" or "Alert".
+    Raises :exc:`RuntimeError` if *gpio* has not been claimed as an input by
+    :func:`setup`.
     """
-    if not mode & (_LG_INPUT | _LG_ALERT):
+    if _pin_dir[gpio] != IN:
         raise RuntimeError(msg)
 
 
-def _check_output(mode,
+def _check_output(gpio,
                   msg='You must setup() the GPIO channel as an output first'):
     """
-    Raises :exc:`RuntimeError` if *mode* (as returned by
-    :func:`lgpio.gpio_get_mode`) does not indicate that the GPIO is configured
-    for "Output".
+    Raises :exc:`RuntimeError` if *gpio* has not been claimed as an output by
+    :func:`setup`.
     """
-    if not mode & _LG_OUTPUT:
+    if _pin_dir[gpio] != OUT:
         raise RuntimeError(msg)
 
 
@@ -264,7 +335,7 @@ def _check_edge(edge):
     """
     Checks *edge* is a valid value.
     """
-    if edge not in (FALLING, RISING, BOTH):
+    if edge not in _VALID_EDGES:
         raise ValueError('The edge must be set to RISING, FALLING or BOTH')
 
 
@@ -282,35 +353,35 @@ def _check_bounce(bouncetime):
     return bouncetime
 
 
-def _get_alert(gpio, mode, edge, bouncetime):
+def _get_alert(gpio, edge, bouncetime):
     """
-    Returns the :class:`_Alert` object for the specified *gpio* (which has the
-    specifed *mode*, as returned by :func:`lgpio.gpio_get_mode`), but only if
+    Returns the :class:`_Alert` object for the specified *gpio*, but only if
     it has compatible *edge* and *bouncetime* settings. If no alerts are set,
     :exc:`KeyError` is raised. If alerts are set, but with incompatible *edge*
     or *bouncetime* values, :exc:`RuntimeError` is raised.
     """
-    if not mode & _LG_ALERT:
-        raise KeyError(gpio)
     alert = _alerts[gpio]
     if alert.edge != edge or alert.bouncetime != bouncetime:
+        if not alert.enabled and not alert.waiting:
+            # The alert was left behind by a prior wait_for_edge; just replace
+            # it with the new settings
+            _unset_alert(gpio)
+            raise KeyError(gpio)
         raise RuntimeError(
             'Conflicting edge detection already enabled for this GPIO '
             'channel')
     return alert
 
 
-def _set_alert(gpio, mode, edge, bouncetime):
+def _set_alert(gpio, pull_up_down, edge, bouncetime):
     """
-    Set up alerts on a *gpio*. The *mode* is the current GPIO mode as returned
-    by :func:`lgpio.gpio_get_mode`. The *edge* is the desired edge detection,
+    Set up alerts on a *gpio*. The *pull_up_down* is the pull the GPIO was
+    claimed with by :func:`setup`. The *edge* is the desired edge detection,
     and *bouncetime* the desired debounce delay.
     """
-    _check(lgpio.gpio_claim_alert(_chip, gpio, {
-        RISING:  lgpio.RISING_EDGE,
-        FALLING: lgpio.FALLING_EDGE,
-        BOTH:    lgpio.BOTH_EDGES,
-    }[edge], mode & _LG_PULLS))
+    _ungroup(gpio)
+    _check(lgpio.gpio_claim_alert(
+        _chip, gpio, _EDGE_MAP[edge], _PULL_MAP[pull_up_down]))
     if bouncetime is not None:
         _check(lgpio.gpio_set_debounce_micros(
             _chip, gpio, bouncetime * 1000))
@@ -333,55 +404,184 @@ def _unset_alert(gpio):
         alert.close()
 
 
-def _retry(func, *args, _count=3, _delay=0.001, **kwargs):
+def _unset_alerts():
     """
-    Under certain circumstances (usually multiple concurrent processes
-    accessing the same GPIO device), GPIO functions can return "GPIO_BUSY". In
-    this case the operation should simply be retried after a delay.
+    Remove alerts on all GPIOs. This is registered to run at exit, to cancel
+    the lgpio callbacks of any outstanding alerts.
     """
-    for i in range(_count):
-        result = func(*args, **kwargs)
-        if result != lgpio.GPIO_BUSY:
-            return _check(result)
-        sleep(_delay)
-    raise RuntimeError(lgpio.error_text(lgpio.GPIO_BUSY))
+    for gpio in list(_alerts):
+        _unset_alert(gpio)
 
 
-def _to_gpio(channel):
+def _set_reserved(gpio, direction, pull_up_down, group=-1, index=-1):
     """
-    Converts *channel* to a GPIO number, according to the globally set
-    :data:`_mode`.
+    Record that *gpio* has been claimed with the specified *direction* and
+    *pull_up_down*, and (optionally) as bit *index* of the lgpio *group*.
     """
-    if _mode == UNKNOWN:
-        raise RuntimeError(
-            'Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or '
-            'GPIO.setmode(GPIO.BCM)')
-    elif _mode == BCM:
-        if not 0 <= channel < 54:
-            raise ValueError('The channel sent is invalid on a Raspberry Pi')
-        return channel
-    elif _mode == BOARD:
+    _pin_dir[gpio] = direction
+    _pin_pull[gpio] = pull_up_down
+    _pin_group[gpio] = group
+    _pin_gidx[gpio] = index
+
+
+def _clear_reserved(gpio):
+    """
+    Record that *gpio* is no longer claimed.
+    """
+    _set_reserved(gpio, -1, -1)
+    _pulses.discard(gpio)
+
+
+def _pulsing(gpio):
+    """
+    Returns :data:`True` if *gpio* is still outputting pulses started by
+    :func:`pulse`. GPIOs whose pulses have finished are forgotten.
+    """
+    if gpio in _pulses:
+        if lgpio.tx_busy(_chip, gpio, lgpio.TX_PWM) > 0:
+            return True
+        _pulses.discard(gpio)
+    return False
+
+
+def _claim_group(gpios, direction, pull_up_down, initial):
+    """
+    Attempt to claim all *gpios* in a single lgpio group, as inputs with the
+    specified *pull_up_down*, or as outputs with the *initial* state (or their
+    current state if this is :data:`None`), according to *direction*. Returns
+    :data:`True` on success, or :data:`False` if the GPIOs could not be grouped
+    and must be claimed individually.
+    """
+    if len(set(gpios)) < len(gpios) or any(
+            _pin_dir[gpio] >= 0 for gpio in gpios):
+        return False
+    try:
+        if direction == IN:
+            _check(lgpio.group_claim_input(
+                _chip, gpios, _PULL_MAP[pull_up_down]))
+        else:
+            if initial is None:
+                levels = [
+                    _check(lgpio.gpio_read(_chip, gpio)) for gpio in gpios]
+            else:
+                levels = [int(initial)] * len(gpios)
+            _check(lgpio.group_claim_output(
+                _chip, gpios, levels, lgpio.SET_PULL_NONE))
+    except (lgpio.error, RuntimeError):
+        return False
+    for index, gpio in enumerate(gpios):
+        _set_reserved(gpio, direction, pull_up_down, gpios[0], index)
+    _groups[gpios[0]] = gpios
+    return True
+
+
+def _ungroup(gpio):
+    """
+    If *gpio* was claimed as part of an lgpio group, free the group and
+    re-claim each of its members individually, retaining their current state.
+    This is required before any member of a group can be re-configured on its
+    own.
+    """
+    leader = _pin_group[gpio]
+    if leader < 0:
+        return
+    result, bits = lgpio.group_read(_chip, leader)
+    _check(result)
+    _check(lgpio.group_free(_chip, leader))
+    members = _groups.pop(leader)
+    # The group no longer exists, so forget it for every member before
+    # attempting to re-claim them. Any member that cannot be re-claimed is no
+    # longer held by us at all, so it is forgotten entirely (and the first
+    # error re-raised once the rest have been dealt with)
+    for member in members:
+        _set_reserved(member, _pin_dir[member], _pin_pull[member])
+    error = None
+    for index, member in enumerate(members):
         try:
-            return _BOARD_MAP[channel]
-        except KeyError:
-            raise ValueError('The channel sent is invalid on a Raspberry Pi')
-    else:
-        assert False, 'Invalid channel mode'
+            if _pin_dir[member] == IN:
+                _check(lgpio.gpio_claim_input(
+                    _chip, member, _PULL_MAP[_pin_pull[member]]))
+            else:
+                _check(lgpio.gpio_claim_output(
+                    _chip, member, (bits >> index) & 1, lgpio.SET_PULL_NONE))
+        except (lgpio.error, RuntimeError) as exc:
+            _clear_reserved(member)
+            if error is None:
+                error = exc
+    if error is not None:
+        raise error
+
+
+def _to_gpio_unknown(channel):
+    """
+    Implementation of :func:`_to_gpio` when no numbering mode has been set.
+    """
+    raise RuntimeError(
+        'Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or '
+        'GPIO.setmode(GPIO.BCM)')
 
 
-def _from_gpio(gpio):
+def _to_gpio_bcm(channel):
     """
-    Converts *gpio* to a channel number, according to the globally set
-    :data:`_mode`.
+    Implementation of :func:`_to_gpio` for the :data:`BCM` numbering mode.
     """
-    if _mode == BCM:
-        return gpio
-    elif _mode == BOARD:
-        return _BCM_MAP[gpio]
-    else:
-        raise RuntimeError(
-            'Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or '
-            'GPIO.setmode(GPIO.BCM)')
+    if not 0 <= channel < _GPIO_COUNT:
+        raise ValueError('The channel sent is invalid on a Raspberry Pi')
+    return channel
+
+
+def _to_gpio_board(channel):
+    """
+    Implementation of :func:`_to_gpio` for the :data:`BOARD` numbering mode.
+    """
+    try:
+        # Negative indexes are valid on a tuple, but not for us
+        gpio = _BOARD_LUT[channel] if channel >= 0 else -1
+    except IndexError:
+        gpio = -1
+    except TypeError:
+        # Not an int; fall back to the mapping which (like the original
+        # implementation) accepts equal-valued non-ints such as 3.0
+        gpio = _BOARD_MAP.get(channel, -1)
+    if gpio < 0:
+        raise ValueError('The channel sent is invalid on a Raspberry Pi')
+    return gpio
+
+
+# Converts a channel to a GPIO number, according to the globally set _mode.
+# This is re-bound by setmode (and cleanup) to one of the implementations above
+# so that the (very common) translation doesn't need to dispatch on _mode
+_to_gpio = _to_gpio_unknown
+
+
+def _from_gpio_unknown(gpio):
+    """
+    Implementation of :func:`_from_gpio` when no numbering mode has been set.
+    """
+    raise RuntimeError(
+        'Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or '
+        'GPIO.setmode(GPIO.BCM)')
+
+
+def _from_gpio_bcm(gpio):
+    """
+    Implementation of :func:`_from_gpio` for the :data:`BCM` numbering mode.
+    """
+    return gpio
+
+
+def _from_gpio_board(gpio):
+    """
+    Implementation of :func:`_from_gpio` for the :data:`BOARD` numbering mode.
+    """
+    # Only GPIOs translated from valid channels ever reach here, so there's no
+    # need to check for the -1 sentinel
+    return _BCM_LUT[gpio]
+
+
+# Converts a GPIO number to a channel, according to the globally set _mode.
+# Like _to_gpio, this is re-bound by setmode (and cleanup)
+_from_gpio = _from_gpio_unknown
 
 
 def _gpio_list(chanlist):
@@ -389,23 +589,86 @@ def _gpio_list(chanlist):
     Convert *chanlist* which may be an iterable, or an int, to a tuple of
     integers
     """
+    to_gpio = _to_gpio
+    # Special-case the common types up front; using TypeError to detect a
+    # scalar is comparatively expensive, and single channels are by far the
+    # most common case
+    if isinstance(chanlist, int):
+        return (to_gpio(int(chanlist)),)
+    # In BCM mode, a tuple of valid GPIO numbers (as libraries layered on this
+    # one tend to pass) needs no translation at all; the checks here all run
+    # in C. Anything else falls through to the generic path which raises the
+    # appropriate errors
+    if to_gpio is _to_gpio_bcm and type(chanlist) is tuple and chanlist and (
+            set(map(type, chanlist)) == {int} and
+            min(chanlist) >= 0 and max(chanlist) < _GPIO_COUNT):
+        return chanlist
     try:
-        return tuple(_to_gpio(int(channel)) for channel in chanlist)
+        if isinstance(chanlist, (list, tuple)):
+            return tuple([to_gpio(int(channel)) for channel in chanlist])
+        return tuple(to_gpio(int(channel)) for channel in chanlist)
     except TypeError:
         try:
-            return (_to_gpio(int(chanlist)),)
+            return (to_gpio(int(chanlist)),)
         except TypeError:
             raise ValueError(
                 'Channel must be an integer or list/tuple of integers')
 
 
-def _in_use(gpio):
-    """
-    Returns :data:`True` if the GPIO has been "claimed" by lgpio. lgpio mode
-    bits (256, 512, 1024, 2048) are only set if the calling process owns the
-    GPIO.
-    """
-    return bool(_check(lgpio.gpio_get_mode(_chip, gpio)) & _LG_MODES)
+# Decoding of the fields of new-style board revision codes
+_P1_REVISIONS = {
+    0x00: 2,
+    0x01: 2,
+    0x06: 0,
+    0x0a: 0,
+    0x10: 0,
+    0x14: 0,
+}
+_BOARD_TYPES = {
+    0x00: 'Model A',
+    0x01: 'Model B',
+    0x02: 'Model A+',
+    0x03: 'Model B+',
+    0x04: 'Pi 2 Model B',
+    0x05: 'Alpha',
+    0x06: 'Compute Module 1',
+    0x08: 'Pi 3 Model B',
+    0x09: 'Zero',
+    0x0a: 'Compute Module 3',
+    0x0c: 'Zero W',
+    0x0d: 'Pi 3 Model B+',
+    0x0e: 'Pi 3 Model A+',
+    0x10: 'Compute Module 3+',
+    0x11: 'Pi 4 Model B',
+    0x12: 'Zero 2 W',
+    0x13: 'Pi 400',
+    0x14: 'Compute Module 4',
+    0x17: 'Pi 5 Model B',
+}
+_MANUFACTURERS = {
+    0: 'Sony UK',
+    1: 'Egoman',
+    2: 'Embest',
+    3: 'Sony Japan',
+    4: 'Embest',
+    5: 'Stadium',
+}
+_PROCESSORS = {
+    0: 'BCM2835',
+    1: 'BCM2836',
+    2: 'BCM2837',
+    3: 'BCM2711',
+    4: 'BCM2712',
+}
+_RAM_SIZES = {
+    0: '256M',
+    1: '512M',
+    2: '1GB',
+    3: '2GB',
+    4: '4GB',
+    5: '8GB',
+    6: '16GB',
+}
 
 
 def _get_rpi_info():
@@ -418,8 +681,12 @@ def _get_rpi_info():
         revision = int(os.environ['RPI_LGPIO_REVISION'], base=16)
     except KeyError:
         try:
-            with open('/proc/device-tree/system/linux,revision', 'rb') as f:
-                revision = struct.unpack('>I', f.read(4))[0]
+            fd = os.open(
+                '/proc/device-tree/system/linux,revision', os.O_RDONLY)
+            try:
+                revision = int.from_bytes(os.read(fd, 4), 'big')
+            finally:
+                os.close(fd)
             if not revision:
                 raise OSError()
         except OSError:
@@ -428,63 +695,68 @@ def _get_rpi_info():
         raise NotImplementedError(
             'This module does not understand old-style revision codes')
     return {
-        'P1_REVISION': {
-            0x00: 2,
-            0x01: 2,
-            0x06: 0,
-            0x0a: 0,
-            0x10: 0,
-            0x14: 0,
-        }.get(revision >> 4 & 0xff, 3),
+        'P1_REVISION': _P1_REVISIONS.get(revision >> 4 & 0xff, 3),
         'REVISION': hex(revision)[2:],
-        'TYPE': {
-            0x00: 'Model A',
-            0x01: 'Model B',
-            0x02: 'Model A+',
-            0x03: 'Model B+',
-            0x04: 'Pi 2 Model B',
-            0x05: 'Alpha',
-            0x06: 'Compute Module 1',
-            0x08: 'Pi 3 Model B',
-            0x09: 'Zero',
-            0x0a: 'Compute Module 3',
-            0x0c: 'Zero W',
-            0x0d: 'Pi 3 Model B+',
-            0x0e: 'Pi 3 Model A+',
-            0x10: 'Compute Module 3+',
-            0x11: 'Pi 4 Model B',
-            0x12: 'Zero 2 W',
-            0x13: 'Pi 400',
-            0x14: 'Compute Module 4',
-            0x17: 'Pi 5 Model B',
-        }.get(revision >> 4 & 0xff, 'Unknown'),
-        'MANUFACTURER': {
-            0: 'Sony UK',
-            1: 'Egoman',
-            2: 'Embest',
-            3: 'Sony Japan',
-            4: 'Embest',
-            5: 'Stadium',
-        }.get(revision >> 16 & 0xf, 'Unknown'),
-        'PROCESSOR': {
-            0: 'BCM2835',
-            1: 'BCM2836',
-            2: 'BCM2837',
-            3: 'BCM2711',
-            4: 'BCM2712',
-        }.get(revision >> 12 & 0xf, 'Unknown'),
-        'RAM': {
-            0: '256M',
-            1: '512M',
-            2: '1GB',
-            3: '2GB',
-            4: '4GB',
-            5: '8GB',
-            6: '16GB',
-        }.get(revision >> 20 & 0x7, 'Unknown'),
+        'TYPE': _BOARD_TYPES.get(revision >> 4 & 0xff, 'Unknown'),
+        'MANUFACTURER': _MANUFACTURERS.get(revision >> 16 & 0xf, 'Unknown'),
+        'PROCESSOR': _PROCESSORS.get(revision >> 12 & 0xf, 'Unknown'),
+        'RAM': _RAM_SIZES.get(revision >> 20 & 0x7, 'Unknown'),
     }
 
 
+def _load_rpi_info():
+    """
+    Sets the :data:`RPI_INFO` and :data:`RPI_REVISION` globals from
+    :func:`_get_rpi_info`. This is deferred until either is first accessed, or
+    :func:`setmode` is called, so that merely importing the module is cheap.
+    """
+    global RPI_INFO, RPI_REVISION
+    RPI_INFO = _get_rpi_info()
+    RPI_REVISION = RPI_INFO['P1_REVISION']
+
+
+def __getattr__(name):
+    """
+    Loads :data:`RPI_INFO` and :data:`RPI_REVISION` lazily on first access.
+    """
+    if name in ('RPI_INFO', 'RPI_REVISION'):
+        _load_rpi_info()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _get_chip():
+    """
+    Returns the handle of the GPIO chip device, opening it if it is not
+    already open.
+    """
+    global _chip
+    with _chip_lock:
+        if _chip is None:
+            _chip = _check(lgpio.gpiochip_open(_get_gpiochip_num()))
+        return _chip
+
+
+def _reset_chip():
+    """
+    Forgets the GPIO chip handle, the numbering mode, and all claimed GPIOs.
+    This is registered to run in the child after a fork; the child must not
+    share the parent's handle (or believe it owns the parent's GPIOs) so it
+    must call :func:`setmode` again before doing anything else.
+    """
+    global _chip, _chip_lock, _mode, _to_gpio, _from_gpio
+    _chip = None
+    _chip_lock = Lock()
+    _mode = UNKNOWN
+    _to_gpio = _to_gpio_unknown
+    _from_gpio = _from_gpio_unknown
+    for gpio in range(_GPIO_COUNT):
+        _clear_reserved(gpio)
+    _groups.clear()
+    _alerts.clear()
+    _pwms.clear()
+
+
 def _get_gpiochip_num():
     """
     Determines the number of the GPIO chip device to access.
@@ -541,16 +813,21 @@ def setmode(new_mode):
     :param int new_mode:
         The new numbering mode to apply
     """
-    global _mode, _chip
+    global _mode, _to_gpio, _from_gpio
 
     if _mode != UNKNOWN and new_mode != _mode:
         raise ValueError('A different mode has already been set!')
-    if new_mode not in (BOARD, BCM):
+    if new_mode not in _VALID_MODES:
         raise ValueError('An invalid mode was passed to setmode()')
 
-    if _chip is None:
-        _chip = _check(lgpio.gpiochip_open(_get_gpiochip_num()))
+    if 'RPI_INFO' not in globals():
+        _load_rpi_info()
+    _get_chip()
     _mode = new_mode
+    if new_mode == BOARD:
+        _to_gpio, _from_gpio = _to_gpio_board, _from_gpio_board
+    else:
+        _to_gpio, _from_gpio = _to_gpio_bcm, _from_gpio_bcm
 
 
 def setwarnings(value):
@@ -594,20 +871,20 @@ def cleanup(chanlist=None):
     :param chanlist:
         The channel, or channels to clean up
     """
-    global _chip, _mode
-    if _chip is None:
+    global _mode, _to_gpio, _from_gpio
+    if _mode == UNKNOWN:
         return
 
-    # If we're cleaning up everything we need to close the chip handle too,
-    # and reset the GPIO mode. But first...
-    close = chanlist is None
+    # If we're cleaning up everything we need to reset the GPIO mode too (the
+    # chip handle is left open for the life of the process, for re-use by a
+    # subsequent setmode; process exit releases it). But first...
+    reset = chanlist is None
     if chanlist is None:
         # Bug compatibility: it's awfully tempting to just re-initialize here,
         # but that doesn't reset pins to inputs, and users may be relying upon
         # this side-effect
-        result, gpios, *tail = lgpio.gpio_get_chip_info(_chip)
-        _check(result)
-        chanlist = [gpio for gpio in range(gpios) if _in_use(gpio)]
+        chanlist = [
+            gpio for gpio, direction in enumerate(_pin_dir) if direction >= 0]
     else:
         chanlist = _gpio_list(chanlist)
 
@@ -615,19 +892,25 @@ def cleanup(chanlist=None):
         for gpio in chanlist:
             # As this is cleanup we ignore all errors (no _check calls); if we
             # didn't own the GPIO, we don't care
+            try:
+                _ungroup(gpio)
+            except (lgpio.error, RuntimeError):
+                pass
             _unset_alert(gpio)
             lgpio.gpio_claim_input(_chip, gpio, lgpio.SET_PULL_NONE)
             lgpio.gpio_free(_chip, gpio)
+            _clear_reserved(gpio)
     elif _warnings:
         warnings.warn(Warning(
             'No channels have been set up yet - nothing to clean up!  Try '
             'cleaning up at the end of your program instead!'))
 
-    if close:
-        lgpio.gpiochip_close(_chip)
-        _chip = None
+    if reset:
         _mode = UNKNOWN
+        _to_gpio = _to_gpio_unknown
+        _from_gpio = _from_gpio_unknown
         assert not _alerts
+        assert max(_pin_dir) < 0
 
 
 def setup(chanlist, direction, pull_up_down=PUD_OFF, initial=None):
@@ -670,34 +953,61 @@ def setup(chanlist, direction, pull_up_down=PUD_OFF, initial=None):
     elif direction == IN:
         if initial is not None:
             raise ValueError('initial parameter is not valid for inputs')
-        if pull_up_down not in (PUD_UP, PUD_DOWN, PUD_OFF):
+        if pull_up_down not in _VALID_PULLS:
             raise ValueError(
                 'Invalid value for pull_up_down - should be either PUD_OFF, '
                 'PUD_UP or PUD_DOWN')
     else:
         raise ValueError('An invalid direction was passed to setup()')
-
-    for gpio in _gpio_list(chanlist):
-        # We don't bother with warnings about GPIOs already in use here because
-        # if we try to *use* a GPIO already in use, things are going to blow up
-        # shortly anyway. We do deal with the pull-up warning, but only for
-        # GPIO2 and GPIO3 because we're not supporting the original RPi so we
-        # don't need to worry about the GPIO0 and GPIO1 discrepancy
-        if _warnings and gpio in (2, 3) and pull_up_down in (PUD_UP, PUD_DOWN):
-            warnings.warn(Warning(
-                'A physical pull up resistor is fitted on this channel!'))
+    # Equal-valued non-ints (e.g. 21.0) pass the checks above, but must be
+    # ints before they're recorded in the reservation tables
+    direction = int(direction)
+    pull_up_down = int(pull_up_down)
+
+    pull = _PULL_MAP[pull_up_down]
+    gpios = _gpio_list(chanlist)
+    # We don't bother with warnings about GPIOs already in use here because if
+    # we try to *use* a GPIO already in use, things are going to blow up
+    # shortly anyway. We do deal with the pull-up warning, but only for GPIO2
+    # and GPIO3 because we're not supporting the original RPi so we don't need
+    # to worry about the GPIO0 and GPIO1 discrepancy
+    if _warnings and pull_up_down != PUD_OFF:
+        for gpio in gpios:
+            if gpio in (2, 3):
+                warnings.warn(Warning(
+                    'A physical pull up resistor is fitted on this channel!'))
+    # Multiple GPIOs are claimed as a single group where possible, which takes
+    # one call instead of one per GPIO, and permits output() to change all of
+    # them with a single group_write
+    if len(gpios) > 1:
+        # Repeating setup() on an existing group with the same settings
+        # needn't dissolve it; only the initial state of outputs (if any) is
+        # re-applied
+        if _groups.get(gpios[0]) == gpios and all(
+                _pin_dir[gpio] == direction and
+                _pin_pull[gpio] == pull_up_down for gpio in gpios):
+            if initial is not None:
+                mask = (1 << len(gpios)) - 1
+                _check(_group_write(
+                    _chip, gpios[0], mask if initial else 0, mask))
+            return
+        if _claim_group(gpios, direction, pull_up_down, initial):
+            return
+    for gpio in gpios:
+        _ungroup(gpio)
         if direction == IN:
+            # Re-claiming the line below discards any alert claim on it
+            _unset_alert(gpio)
             # This gpio_free may seem redundant, but is required when changing
-            # the line-flags of an already acquired input line
-            try:
-                lgpio.gpio_free(_chip, gpio)
-            except lgpio.error:
-                pass
-            _check(lgpio.gpio_claim_input(_chip, gpio, {
-                PUD_OFF:  lgpio.SET_PULL_NONE,
-                PUD_DOWN: lgpio.SET_PULL_DOWN,
-                PUD_UP:   lgpio.SET_PULL_UP,
-            }[pull_up_down]))
+            # the line-flags of an already acquired input line. Lines we
+            # haven't claimed are skipped to save a syscall (and an exception)
+            # on the common first call
+            if _pin_dir[gpio] >= 0:
+                try:
+                    lgpio.gpio_free(_chip, gpio)
+                except lgpio.error:
+                    pass
+            _check(lgpio.gpio_claim_input(_chip, gpio, pull))
         elif direction == OUT:
             _unset_alert(gpio)
             if initial is None:
@@ -706,6 +1016,7 @@ def setup(chanlist, direction, pull_up_down=PUD_OFF, initial=None):
                 _chip, gpio, initial, lgpio.SET_PULL_NONE))
         else:
             assert False, 'Invalid direction'
+        _set_reserved(gpio, direction, pull_up_down)
 
 
 def input(channel):
@@ -719,9 +1030,50 @@ def input(channel):
         The board pin number or BCM number depending on :func:`setmode`
     """
     gpio = _to_gpio(channel)
-    if not _in_use(gpio):
+    if _pin_dir[gpio] < 0:
         raise RuntimeError('You must setup() the GPIO channel first')
-    return _check(lgpio.gpio_read(_chip, gpio))
+    # _check is inlined here (and in output) as this is a hot path
+    result = _gpio_read(_chip, gpio)
+    if result < 0:
+        raise RuntimeError(_error_text(result))
+    return result
+
+
+def input_many(chanlist):
+    """
+    Input from a list of GPIO channels in *chanlist*. Returns a list of 1 or 0
+    values, one for each channel, in the same order.
+
+    GPIOs claimed together as a group (by passing a list of channels to
+    :func:`setup`) are read with a single call per group, rather than one per
+    channel.
+
+    .. note::
+
+        This function is an extension; it is not present in RPi.GPIO.
+
+    :type chanlist: list or tuple or int
+    :param chanlist:
+        The GPIO channel, or list of GPIO channels to read
+    """
+    gpios = _gpio_list(chanlist)
+    groups = {}
+    result = []
+    for gpio in gpios:
+        if _pin_dir[gpio] < 0:
+            raise RuntimeError('You must setup() the GPIO channel first')
+        leader = _pin_group[gpio]
+        if leader >= 0:
+            try:
+                bits = groups[leader]
+            except KeyError:
+                status, bits = lgpio.group_read(_chip, leader)
+                _check(status)
+                groups[leader] = bits
+            result.append(bits >> _pin_gidx[gpio] & 1)
+        else:
+            result.append(_check(_gpio_read(_chip, gpio)))
+    return result
 
 
 def output(channel, value):
@@ -741,25 +1093,124 @@ def output(channel, value):
     :param value:
         The value, or list of values to output
     """
+    # The overwhelmingly common call is a single channel and an integer value;
+    # handle it without building lists of GPIOs and values
+    if isinstance(channel, int) and isinstance(value, int):
+        gpio = _to_gpio(channel)
+        if _pin_dir[gpio] != OUT:
+            raise RuntimeError(
+                'The GPIO channel has not been set up as an OUTPUT')
+        leader = _pin_group[gpio]
+        if leader < 0:
+            result = _gpio_write(_chip, gpio, 1 if value else 0)
+            if result < 0:
+                raise RuntimeError(_error_text(result))
+        else:
+            bit = 1 << _pin_gidx[gpio]
+            _check(_group_write(_chip, leader, bit if value else 0, bit))
+        return
     gpios = _gpio_list(channel)
-    try:
-        values = tuple(bool(item) for item in value)
-    except TypeError:
+    # Values are converted to a bytes string of 0s and 1s (which can be
+    # passed straight to lgpio), special-casing scalars so the common calls
+    # don't rely on catching TypeError
+    if isinstance(value, int):
+        values = b'\x01' if value else b'\x00'
+    else:
         try:
-            values = (bool(value),)
+            values = bytes(map(bool, value))
         except TypeError:
-            raise ValueError(
-                'Value must be an integer/boolean or list/tuple of '
-                'integers/booleans')
+            try:
+                values = bytes((bool(value),))
+            except TypeError:
+                raise ValueError(
+                    'Value must be an integer/boolean or list/tuple of '
+                    'integers/booleans')
     if len(gpios) != len(values):
         if len(gpios) > 1 and len(values) == 1:
             values = values * len(gpios)
         else:
             raise RuntimeError('Number of channels != number of values')
+    chip = _chip
+    # Writing to an entire output group, in its original order, is common
+    # enough to be worth special-casing. In this case the values can be
+    # converted to the group's bits in one go by parsing them as binary
+    # digits (most significant first)
+    if len(gpios) > 1 and _groups.get(gpios[0]) == gpios and (
+            _pin_dir[gpios[0]] == OUT):
+        bits = int(values[::-1].translate(_BINARY_DIGITS), 2)
+        _check(_group_write(chip, gpios[0], bits, (1 << len(gpios)) - 1))
+        return
+    # Otherwise, writes to GPIOs claimed as part of a group are accumulated
+    # into a (bits, mask) pair per group leader, and written with one
+    # group_write
+    groups = {}
+    # Bind frequently used globals to locals for the loop
+    pin_dir = _pin_dir
+    pin_group = _pin_group
+    write = _gpio_write
     for gpio, value in zip(gpios, values):
-        mode = lgpio.gpio_get_mode(_chip, gpio)
-        _check_output(mode, 'The GPIO channel has not been set up as an OUTPUT')
-        _check(lgpio.gpio_write(_chip, gpio, value))
+        if pin_dir[gpio] != OUT:
+            raise RuntimeError(
+                'The GPIO channel has not been set up as an OUTPUT')
+        leader = pin_group[gpio]
+        if leader >= 0:
+            bits, mask = groups.get(leader, (0, 0))
+            bit = 1 << _pin_gidx[gpio]
+            groups[leader] = (
+                bits | bit if value else bits & ~bit, mask | bit)
+        else:
+            result = write(chip, gpio, value)
+            if result < 0:
+                raise RuntimeError(_error_text(result))
+    for leader, (bits, mask) in groups.items():
+        _check(_group_write(chip, leader, bits, mask))
+
+
+def pulse(channel, on_micros, off_micros, cycles=0):
+    """
+    Output pulses on a GPIO *channel*, which must have been set up as an
+    output. Each pulse holds the channel high for *on_micros* microseconds
+    and low for *off_micros* microseconds. The pulses are timed by lgpio
+    rather than Python, so this is far more precise (and far cheaper) than
+    toggling the channel with :func:`output` in a loop.
+
+    If *cycles* is 0 (the default), pulses continue until :func:`pulse` is
+    called again on the channel; passing 0 for both *on_micros* and
+    *off_micros* stops them. This call does not wait for the pulses to
+    complete. A :class:`PWM` object cannot be created for the channel while
+    pulses are being output on it.
+
+    .. note::
+
+        This function is an extension; it is not present in RPi.GPIO.
+
+    :param int channel:
+        The board pin number or BCM number depending on :func:`setmode`
+
+    :param int on_micros:
+        The number of microseconds each pulse is high for
+
+    :param int off_micros:
+        The number of microseconds each pulse is low for
+
+    :param int cycles:
+        The number of pulses to output, or 0 to repeat indefinitely
+    """
+    gpio = _to_gpio(channel)
+    _check_output(gpio)
+    if gpio in _pwms:
+        raise RuntimeError('A PWM object already exists for this GPIO channel')
+    on_micros, off_micros = int(on_micros), int(off_micros)
+    cycles = int(cycles)
+    if on_micros < 0 or off_micros < 0 or cycles < 0:
+        raise ValueError(
+            'on_micros, off_micros, and cycles must not be negative')
+    _ungroup(gpio)
+    _check(lgpio.tx_pulse(_chip, gpio, on_micros, off_micros, 0, cycles))
+    if on_micros or off_micros:
+        _pulses.add(gpio)
+    else:
+        _pulses.discard(gpio)
 
 
 def wait_for_edge(channel, edge, bouncetime=None, timeout=None):
@@ -789,35 +1240,35 @@ def wait_for_edge(channel, edge, bouncetime=None, timeout=None):
         Maximum time (in ms) to wait for the edge
     """
     gpio = _to_gpio(channel)
-    mode = _check(lgpio.gpio_get_mode(_chip, gpio))
-    _check_input(mode)
+    _check_input(gpio)
     _check_edge(edge)
     bouncetime = _check_bounce(bouncetime)
     if timeout is not None and timeout <= 0:
         raise ValueError('Timeout must be greater than 0')
 
     try:
-        alert = _get_alert(gpio, mode, edge, bouncetime)
+        alert = _get_alert(gpio, edge, bouncetime)
     except KeyError:
-        unset = True
-        alert = _set_alert(gpio, mode, edge, bouncetime)
+        alert = _set_alert(gpio, _pin_pull[gpio], edge, bouncetime)
     else:
-        unset = False
         # Bug compatibility: this is how RPi.GPIO operates
-        if alert.callbacks:
+        if alert.callbacks or alert.waiting:
             raise RuntimeError(
                 'Conflicting edge detection already enabled for this GPIO '
                 'channel')
-    evt = Event()
-    alert.callbacks.append(lambda i: evt.set())
+    alert.event.clear()
+    alert.waiting = True
     if timeout is not None:
         timeout /= 1000
-    if evt.wait(timeout):
-        result = channel
-    else:
-        result = None
-    if unset:
-        _unset_alert(gpio)
+    try:
+        if alert.event.wait(timeout):
+            result = channel
+        else:
+            result = None
+    finally:
+        alert.waiting = False
+    # The alert is deliberately left in place (but not enabled) so that
+    # repeated waits with the same settings need not re-claim it
     return result
 
 
@@ -854,17 +1305,17 @@ def add_event_detect(channel, edge, callback=None, bouncetime=None):
     if callback is not None and not callable(callback):
         raise TypeError('Parameter must be callable')
     gpio = _to_gpio(channel)
-    mode = _check(lgpio.gpio_get_mode(_chip, gpio))
-    _check_input(mode)
+    _check_input(gpio)
     _check_edge(edge)
     bouncetime = _check_bounce(bouncetime)
     try:
-        alert = _get_alert(gpio, mode, edge, bouncetime)
+        alert = _get_alert(gpio, edge, bouncetime)
     except KeyError:
-        alert = _set_alert(gpio, mode, edge, bouncetime)
+        alert = _set_alert(gpio, _pin_pull[gpio], edge, bouncetime)
+    alert.enable()
 
     if callback is not None:
-        alert.callbacks.append(callback)
+        alert.callbacks += (callback,)
 
 
 def add_event_callback(channel, callback):
@@ -883,16 +1334,13 @@ def add_event_callback(channel, callback):
     if not callable(callback):
         raise TypeError('Parameter must be callable')
     gpio = _to_gpio(channel)
-    mode = _check(lgpio.gpio_get_mode(_chip, gpio))
-    _check_input(mode)
-    try:
-        alert = _alerts[gpio]
-    except KeyError:
+    _check_input(gpio)
+    alert = _alerts.get(gpio)
+    if alert is None or not alert.enabled:
         raise RuntimeError(
             'Add event detection using add_event_detect first before adding '
             'a callback')
-    else:
-        alert.callbacks.append(callback)
+    alert.callbacks += (callback,)
 
 
 def remove_event_detect(channel):
@@ -919,10 +1367,11 @@ def event_detected(channel):
         The board pin number or BCM number depending on :func:`setmode`
     """
     try:
-        return _alerts[_to_gpio(channel)].detected
+        alert = _alerts[_to_gpio(channel)]
     except KeyError:
         return False
+    return alert.enabled and alert.detected
 
 
-RPI_INFO = _get_rpi_info()
-RPI_REVISION = RPI_INFO['P1_REVISION']
+atexit.register(_unset_alerts)
+os.register_at_fork(after_in_child=_reset_chip)